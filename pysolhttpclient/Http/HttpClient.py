@@ -23,8 +23,9 @@
 """
 
 import logging
+import time
+from collections import OrderedDict
 
-import gevent
 import urllib3
 from gevent.threading import Lock
 from gevent.timeout import Timeout
@@ -32,13 +33,36 @@ from geventhttpclient.client import PROTO_HTTPS, HTTPClient
 from geventhttpclient.url import URL
 from pysolbase.SolBase import SolBase
 from urllib3 import PoolManager, ProxyManager, Retry
+from urllib3.connectionpool import port_by_scheme
 
 from pysolhttpclient.Http.HttpResponse import HttpResponse
 
 logger = logging.getLogger(__name__)
 
-# Suppress warnings
-urllib3.disable_warnings()
+# Supported methods : sent without body, sent with post_data
+_BODYLESS = frozenset(("GET", "HEAD", "OPTIONS", "TRACE"))
+_BODIED = frozenset(("POST", "PUT", "PATCH", "DELETE"))
+
+
+class _PoolEntry(object):
+    """
+    Pool entry (gevent and urllib3 proxy pools)
+    """
+
+    __slots__ = ("client", "last_used")
+
+    def __init__(self, client):
+        """
+        Const
+        :param client: HTTPClient or urllib3.poolmanager.ProxyManager
+        :type client: HTTPClient, urllib3.poolmanager.ProxyManager
+        """
+
+        # Pooled client
+        self.client = client
+
+        # Last use (time.monotonic, seconds)
+        self.last_used = time.monotonic()
 
 
 class HttpClient(object):
@@ -50,22 +74,216 @@ class HttpClient(object):
     HTTP_IMPL_GEVENT = 1
     HTTP_IMPL_URLLIB3 = 3
 
+    # Pools are split into shards (each with its own lock and dict), shard is hash(key) & mask
+    # Shard count MUST be a power of 2
+    POOL_SHARD_COUNT = 16
+    _POOL_SHARD_MASK = POOL_SHARD_COUNT - 1
+
+    # Urllib3 warnings suppressed (done once, on first instance, see __init__)
+    _u3_warnings_disabled = False
+
+    # Urllib3 basic pool manager, shared by all instances (lazy, see __init__)
+    _shared_u3_basic_pool = None
+
+    # Urllib3 retries : none (Retry is not altered by urllib3, increment returns a new instance)
+    _NO_RETRY = Retry(total=0, connect=0, read=0, redirect=0)
+
+    # ====================================
+    # METHOD DISPATCH
+    # ====================================
+
+    @staticmethod
+    def _gevent_get(http, url, http_request):
+        """
+        Gevent GET
+        :param http: geventhttpclient.client.HTTPClient
+        :type http: geventhttpclient.client.HTTPClient
+        :param url: geventhttpclient.url.URL
+        :type url: geventhttpclient.url.URL
+        :param http_request: HttpRequest
+        :type http_request: HttpRequest
+        :return geventhttpclient.response.HTTPSocketPoolResponse
+        :rtype geventhttpclient.response.HTTPSocketPoolResponse
+        """
+
+        return http.get(url.request_uri,
+                        headers=http_request.headers)
+
+    @staticmethod
+    def _gevent_head(http, url, http_request):
+        """
+        Gevent HEAD
+        :param http: geventhttpclient.client.HTTPClient
+        :type http: geventhttpclient.client.HTTPClient
+        :param url: geventhttpclient.url.URL
+        :type url: geventhttpclient.url.URL
+        :param http_request: HttpRequest
+        :type http_request: HttpRequest
+        :return geventhttpclient.response.HTTPSocketPoolResponse
+        :rtype geventhttpclient.response.HTTPSocketPoolResponse
+        """
+
+        return http.head(url.request_uri,
+                         headers=http_request.headers)
+
+    @staticmethod
+    def _gevent_post(http, url, http_request):
+        """
+        Gevent POST
+        :param http: geventhttpclient.client.HTTPClient
+        :type http: geventhttpclient.client.HTTPClient
+        :param url: geventhttpclient.url.URL
+        :type url: geventhttpclient.url.URL
+        :param http_request: HttpRequest
+        :type http_request: HttpRequest
+        :return geventhttpclient.response.HTTPSocketPoolResponse
+        :rtype geventhttpclient.response.HTTPSocketPoolResponse
+        """
+
+        return http.post(url.request_uri,
+                         body=http_request.post_data,
+                         headers=http_request.headers)
+
+    @staticmethod
+    def _gevent_put(http, url, http_request):
+        """
+        Gevent PUT
+        :param http: geventhttpclient.client.HTTPClient
+        :type http: geventhttpclient.client.HTTPClient
+        :param url: geventhttpclient.url.URL
+        :type url: geventhttpclient.url.URL
+        :param http_request: HttpRequest
+        :type http_request: HttpRequest
+        :return geventhttpclient.response.HTTPSocketPoolResponse
+        :rtype geventhttpclient.response.HTTPSocketPoolResponse
+        """
+
+        return http.put(url.request_uri,
+                        body=http_request.post_data,
+                        headers=http_request.headers)
+
+    @staticmethod
+    def _gevent_delete(http, url, http_request):
+        """
+        Gevent DELETE
+        :param http: geventhttpclient.client.HTTPClient
+        :type http: geventhttpclient.client.HTTPClient
+        :param url: geventhttpclient.url.URL
+        :type url: geventhttpclient.url.URL
+        :param http_request: HttpRequest
+        :type http_request: HttpRequest
+        :return geventhttpclient.response.HTTPSocketPoolResponse
+        :rtype geventhttpclient.response.HTTPSocketPoolResponse
+        """
+
+        return http.delete(url.request_uri,
+                           body=http_request.post_data,
+                           headers=http_request.headers)
+
+    @staticmethod
+    def _u3_urlopen_bodyless(conn, method, http_request, retries):
+        """
+        Urllib3 urlopen, without body
+        :param conn: urllib3.connectionpool.HTTPConnectionPool, urllib3.poolmanager.PoolManager
+        :type conn: urllib3.connectionpool.HTTPConnectionPool, urllib3.poolmanager.PoolManager
+        :param method: str
+        :type method: str
+        :param http_request: HttpRequest
+        :type http_request: HttpRequest
+        :param retries: urllib3.util.retry.Retry
+        :type retries: urllib3.util.retry.Retry
+        :return urllib3.response.HTTPResponse
+        :rtype urllib3.response.HTTPResponse
+        """
+
+        return conn.urlopen(
+            method=method,
+            url=http_request.uri,
+            headers=http_request.headers,
+            redirect=False,
+            retries=retries,
+            preload_content=not http_request.stream,
+        )
+
+    @staticmethod
+    def _u3_urlopen_bodied(conn, method, http_request, retries):
+        """
+        Urllib3 urlopen, with post_data as body
+        :param conn: urllib3.connectionpool.HTTPConnectionPool, urllib3.poolmanager.PoolManager
+        :type conn: urllib3.connectionpool.HTTPConnectionPool, urllib3.poolmanager.PoolManager
+        :param method: str
+        :type method: str
+        :param http_request: HttpRequest
+        :type http_request: HttpRequest
+        :param retries: urllib3.util.retry.Retry
+        :type retries: urllib3.util.retry.Retry
+        :return urllib3.response.HTTPResponse
+        :rtype urllib3.response.HTTPResponse
+        """
+
+        return conn.urlopen(
+            method=method,
+            url=http_request.uri,
+            body=http_request.post_data,
+            headers=http_request.headers,
+            redirect=False,
+            retries=retries,
+            preload_content=not http_request.stream,
+        )
+
+    # Gevent method dispatch : method => fn(http, url, http_request) => response
+    # Not present : unsupported by gevent (PATCH, OPTIONS, TRACE, in _BODYLESS / _BODIED) or invalid
+    # (__func__ : staticmethod objects are not callable before python 3.10)
+    _GEVENT_DISPATCH = {
+        "GET": _gevent_get.__func__,
+        "HEAD": _gevent_head.__func__,
+        "POST": _gevent_post.__func__,
+        "PUT": _gevent_put.__func__,
+        "DELETE": _gevent_delete.__func__,
+    }
+
+    # Urllib3 method dispatch : method => fn(conn, method, http_request, retries) => response
+    _URLLIB3_DISPATCH = {
+        **dict.fromkeys(_BODYLESS, _u3_urlopen_bodyless.__func__),
+        **dict.fromkeys(_BODIED, _u3_urlopen_bodied.__func__),
+    }
+
     def __init__(self):
         """
         Const
         """
 
         # Gevent
+        # Shards are LRU (OrderedDict, coldest first), values are _PoolEntry
+        # Max size is global : when reached, the coldest entry of the allocating shard is evicted
+        # (if this shard is empty, allocation goes on, so size is bounded by max + shard count - 1)
+        # Evicted clients are only dropped (not closed) : they may still serve in-flight requests or streams
+        # and are closed by the GC once no longer referenced
         self._gevent_pool_max = 1024
-        self._gevent_locker = Lock()
-        self._gevent_pool = dict()
+        self._gevent_shards = [(Lock(), OrderedDict()) for _ in range(HttpClient.POOL_SHARD_COUNT)]
+        self._gevent_pool_size = 0
 
         # urllib3
+        # Suppress warnings (once)
+        if not HttpClient._u3_warnings_disabled:
+            urllib3.disable_warnings()
+            HttpClient._u3_warnings_disabled = True
+
+        # Basic pool manager is shared across instances (maximize keep alive reuse)
         # Force underlying fifo queue to 1024 via maxsize
-        self._u3_basic_pool = PoolManager(num_pools=1024, maxsize=1024)
+        if HttpClient._shared_u3_basic_pool is None:
+            HttpClient._shared_u3_basic_pool = PoolManager(num_pools=1024, maxsize=1024)
+        self._u3_basic_pool = HttpClient._shared_u3_basic_pool
+
+        # Basic pool manager pool keys and request contexts, by (scheme, host, port) (lru, coldest dropped when maxed)
+        # Pools are still fetched from the manager (refresh its lru, re-allocate pools it has evicted)
+        self._u3_conn_cache_max = 1024
+        self._u3_conn_cache = OrderedDict()
+
+        # Proxy pools : shards, same as gevent ones
         self._u3_proxy_pool_max = 1024
-        self._u3_proxy_locker = Lock()
-        self._u3_proxy_pool = dict()
+        self._u3_proxy_shards = [(Lock(), OrderedDict()) for _ in range(HttpClient.POOL_SHARD_COUNT)]
+        self._u3_proxy_pool_size = 0
 
     # ====================================
     # GEVENT HTTP POOL
@@ -82,8 +300,8 @@ class HttpClient(object):
         :rtype HTTPClient
         """
 
-        # Compute key
-        key = "{0}#{1}#{2}#{3}#{4}#{5}#{6}#{7}#{8}#{9}#".format(
+        # Key
+        key = (
             # host and port
             url.host,
             url.port,
@@ -92,42 +310,52 @@ class HttpClient(object):
             # Other dynamic stuff
             http_request.https_insecure,
             http_request.disable_ipv6,
-            http_request.connection_timeout_ms / 1000,
-            http_request.network_timeout_ms / 1000,
+            http_request.connection_timeout_ms,
+            http_request.network_timeout_ms,
             http_request.http_concurrency,
             http_request.http_proxy_host,
             http_request.http_proxy_port,
         )
 
-        # Check
-        if key in self._gevent_pool:
-            SolBase.sleep(0)
-            return self._gevent_pool[key]
-
-        # Allocate (in lock)
-        with self._gevent_locker:
-            # Check maxed
-            if len(self._gevent_pool) >= self._gevent_pool_max:
-                raise Exception("gevent pool maxed, cur={0}, max={1}".format(
-                    len(self._gevent_pool), self._gevent_pool_max
-                ))
+        # Check (lock free)
+        shard_locker, shard_pool = self._gevent_shards[hash(key) & HttpClient._POOL_SHARD_MASK]
+        entry = shard_pool.get(key)
+        if entry is not None:
+            entry.last_used = time.monotonic()
+            shard_pool.move_to_end(key)
+            return entry.client
+
+        # Allocate (in shard lock)
+        with shard_locker:
+            # Re-check, may have been allocated while we were waiting for the lock
+            entry = shard_pool.get(key)
+            if entry is not None:
+                entry.last_used = time.monotonic()
+                shard_pool.move_to_end(key)
+                return entry.client
+
+            # Check maxed : evict coldest of shard (dropped, not closed, may be in use)
+            if self._gevent_pool_size >= self._gevent_pool_max and shard_pool:
+                evicted_key, evicted = shard_pool.popitem(last=False)
+                self._gevent_pool_size -= 1
+                logger.info("Evicting pool (maxed) for key=%s, max=%s, last_used=%s", evicted_key, self._gevent_pool_max, evicted.last_used)
 
             # Ok, allocate
             http = HTTPClient.from_url(
                 url,
                 insecure=http_request.https_insecure,
                 disable_ipv6=http_request.disable_ipv6,
-                connection_timeout=http_request.connection_timeout_ms / 1000,
-                network_timeout=http_request.network_timeout_ms / 1000,
+                connection_timeout=http_request.connection_timeout_ms / 1000.0,
+                network_timeout=http_request.network_timeout_ms / 1000.0,
                 concurrency=http_request.http_concurrency,
                 proxy_host=http_request.http_proxy_host,
                 proxy_port=http_request.http_proxy_port,
                 headers={},
             )
 
-            self._gevent_pool[key] = http
-            logger.info("Started new pool for key=%s", key)
-            SolBase.sleep(0)
+            shard_pool[key] = _PoolEntry(http)
+            self._gevent_pool_size += 1
+            logger.info("Started new pool for key=%s, size=%s", key, self._gevent_pool_size)
             return http
 
     # ====================================
@@ -144,27 +372,33 @@ class HttpClient(object):
         """
 
         if not http_request.http_proxy_host:
-            SolBase.sleep(0)
             return self._u3_basic_pool
 
-        # Compute key
-        key = "{0}#{1}#".format(
-            http_request.http_proxy_host,
-            http_request.http_proxy_port,
-        )
-
-        # Check
-        if key in self._u3_proxy_pool:
-            SolBase.sleep(0)
-            return self._u3_proxy_pool[key]
-
-        # Allocate (in lock)
-        with self._u3_proxy_locker:
-            # Check maxed
-            if len(self._u3_proxy_pool) >= self._u3_proxy_pool_max:
-                raise Exception("u3 pool maxed, cur={0}, max={1}".format(
-                    len(self._u3_proxy_pool), self._u3_proxy_pool_max
-                ))
+        # Key
+        key = (http_request.http_proxy_host, http_request.http_proxy_port)
+
+        # Check (lock free)
+        shard_locker, shard_pool = self._u3_proxy_shards[hash(key) & HttpClient._POOL_SHARD_MASK]
+        entry = shard_pool.get(key)
+        if entry is not None:
+            entry.last_used = time.monotonic()
+            shard_pool.move_to_end(key)
+            return entry.client
+
+        # Allocate (in shard lock)
+        with shard_locker:
+            # Re-check, may have been allocated while we were waiting for the lock
+            entry = shard_pool.get(key)
+            if entry is not None:
+                entry.last_used = time.monotonic()
+                shard_pool.move_to_end(key)
+                return entry.client
+
+            # Check maxed : evict coldest of shard (dropped, not closed, may be in use)
+            if self._u3_proxy_pool_size >= self._u3_proxy_pool_max and shard_pool:
+                evicted_key, evicted = shard_pool.popitem(last=False)
+                self._u3_proxy_pool_size -= 1
+                logger.info("Evicting pool (maxed) for key=%s, max=%s, last_used=%s", evicted_key, self._u3_proxy_pool_max, evicted.last_used)
 
             # Uri
             proxy_url = "http://{0}:{1}".format(
@@ -174,11 +408,53 @@ class HttpClient(object):
             # Ok, allocate
             # Force underlying fifo queue to 1024 via maxsize
             p = ProxyManager(num_pools=1024, maxsize=1024, proxy_url=proxy_url)
-            self._u3_proxy_pool[key] = p
-            logger.info("Started new pool for key=%s", key)
-            SolBase.sleep(0)
+            shard_pool[key] = _PoolEntry(p)
+            self._u3_proxy_pool_size += 1
+            logger.info("Started new pool for key=%s, size=%s", key, self._u3_proxy_pool_size)
             return p
 
+    def _u3_connection_from_url(self, u3_pool, url):
+        """
+        Get a u3 connection pool from basic pool manager and url, pool key and request context cached by (scheme, host, port)
+        :param u3_pool: urllib3.poolmanager.PoolManager
+        :type u3_pool: urllib3.poolmanager.PoolManager
+        :param url: geventhttpclient.url.URL
+        :type url: geventhttpclient.url.URL
+        :return urllib3.connectionpool.HTTPConnectionPool
+        :rtype urllib3.connectionpool.HTTPConnectionPool
+        """
+
+        key = (url.scheme, url.host, url.port)
+
+        # Check : hit, refresh (manager lru refreshed by pools get, re-allocated if evicted by the manager)
+        # Context is copied when re-allocating (popped by the manager while allocating)
+        tu = self._u3_conn_cache.get(key)
+        if tu is not None:
+            self._u3_conn_cache.move_to_end(key)
+            conn = u3_pool.pools.get(tu[0])
+            if conn is not None:
+                return conn
+            return u3_pool.connection_from_pool_key(tu[0], request_context=tu[1].copy())
+
+        # Check maxed : drop coldest
+        if len(self._u3_conn_cache) >= self._u3_conn_cache_max:
+            self._u3_conn_cache.popitem(last=False)
+
+        # Build context and pool key (same as PoolManager.connection_from_url)
+        # Ipv6 literal : urllib3 keeps brackets (parse_url), geventhttpclient strips them (re-add, else same host gets two pools)
+        host = url.host
+        if ":" in host:
+            host = "[" + host + "]"
+        request_context = u3_pool.connection_pool_kw.copy()
+        request_context["scheme"] = url.scheme or "http"
+        request_context["port"] = url.port or port_by_scheme.get(request_context["scheme"].lower(), 80)
+        request_context["host"] = host
+        pool_key = u3_pool.key_fn_by_scheme[request_context["scheme"].lower()](request_context)
+        self._u3_conn_cache[key] = (pool_key, request_context)
+
+        # Get it (the manager still owns the pool)
+        return u3_pool.connection_from_pool_key(pool_key, request_context=request_context.copy())
+
     # ====================================
     # HTTP EXEC
     # ====================================
@@ -194,17 +470,14 @@ class HttpClient(object):
 
         ms = SolBase.mscurrent()
         http_response = HttpResponse()
-        general_timeout_sec = float(http_request.general_timeout_ms) / 1000.0
+        general_timeout_sec = http_request.general_timeout_ms / 1000.0
         try:
             # Assign request
             http_response.http_request = http_request
 
-            # Fire
-            gevent.with_timeout(
-                general_timeout_sec,
-                self._go_http_internal,
-                http_request, http_response)
-            SolBase.sleep(0)
+            # Fire (Timeout raised inside the block on expiration)
+            with Timeout(general_timeout_sec):
+                self._go_http_internal(http_request, http_response)
         except Timeout:
             # Failed
             http_response.exception = Exception("Timeout while processing, general_timeout_sec={0}".format(general_timeout_sec))
@@ -212,7 +485,7 @@ class HttpClient(object):
             # Failed
             http_response.exception = e
         finally:
-            # Switch
+            # Switch (single cooperative yield, once request is fully processed)
             SolBase.sleep(0)
             # Assign ms
             http_response.elapsed_ms = SolBase.msdiff(ms)
@@ -230,33 +503,21 @@ class HttpClient(object):
         """
 
         try:
-            # Default to gevent
-            impl = http_request.force_http_implementation
-            if impl == HttpClient.HTTP_IMPL_AUTO:
-                # Fallback gevent (urllib3 issue with latest uwsgi, gevent 1.1.1)
-                impl = HttpClient.HTTP_IMPL_URLLIB3
-                # impl = HttpClient.HTTP_IMPL_GEVENT
+            # Implementation
+            impl = http_request.resolved_impl
 
-            # Uri
+            # Uri (parsed once, passed down)
             url = URL(http_request.uri)
-            SolBase.sleep(0)
-
-            # If proxy and https => urllib3
-            if http_request.http_proxy_host and url.scheme == PROTO_HTTPS:
-                # Fallback gevent (urllib3 issue with latest uwsgi, gevent 1.1.1)
-                impl = HttpClient.HTTP_IMPL_URLLIB3
-                # impl = HttpClient.HTTP_IMPL_GEVENT
 
             # Log
-            logger.debug("Http using impl=%s", impl)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Http using impl=%s", impl)
 
             # Fire
             if impl == HttpClient.HTTP_IMPL_GEVENT:
-                self._go_gevent(http_request, http_response)
-                SolBase.sleep(0)
+                self._go_gevent(http_request, http_response, url)
             elif impl == HttpClient.HTTP_IMPL_URLLIB3:
-                self._go_urllib3(http_request, http_response)
-                SolBase.sleep(0)
+                self._go_urllib3(http_request, http_response, url)
             else:
                 raise Exception("Invalid force_http_implementation")
         except Exception as e:
@@ -280,98 +541,61 @@ class HttpClient(object):
         :param v: str
         """
 
-        if k not in d:
+        cur = d.get(k)
+        if cur is None:
             d[k] = v
+        elif isinstance(cur, list):
+            # Already present, just append
+            cur.append(v)
         else:
-            # Already present
-            if isinstance(d[k], list):
-                # Just append
-                d[k].append(v)
-            else:
-                # Build a list, existing value and new value
-                d[k] = [d[k], v]
+            # Already present, build a list, existing value and new value
+            d[k] = [cur, v]
 
     # ====================================
     # GEVENT
     # ====================================
 
-    def _go_gevent(self, http_request, http_response):
+    def _go_gevent(self, http_request, http_response, url):
         """
         Perform an http request
         :param http_request: HttpRequest
         :type http_request: HttpRequest
         :param http_response: HttpResponse
         :type http_response: HttpResponse
+        :param url: geventhttpclient.url.URL (parsed http_request.uri)
+        :type url: geventhttpclient.url.URL
         """
 
         # Implementation
         http_response.http_implementation = HttpClient.HTTP_IMPL_GEVENT
 
-        # Uri
-        url = URL(http_request.uri)
-        SolBase.sleep(0)
+        # Debug (checked once)
+        is_debug = logger.isEnabledFor(logging.DEBUG)
 
         # Patch for path attribute error
-        try:
-            _ = url.path
-        except AttributeError:
+        if getattr(url, "path", None) is None:
             url.path = "/"
 
         # Get instance
-        logger.debug("Get pool")
         http = self.gevent_from_pool(url, http_request)
-        logger.debug("Get pool done, pool=%s", http)
-        SolBase.sleep(0)
 
         # Fire
-        ms_start = SolBase.mscurrent()
-        logger.debug("Http now")
-        if not http_request.method:
-            # ----------------
+        if is_debug:
+            logger.debug("Http now, pool=%s", http)
+            ms_start = SolBase.mscurrent()
+        method = http_request.method
+        if not method:
             # Auto-detect
-            # ----------------
-            if http_request.post_data:
-                # Post
-                response = http.post(url.request_uri,
-                                     body=http_request.post_data,
-                                     headers=http_request.headers)
-            else:
-                # Get
-                response = http.get(url.request_uri,
-                                    headers=http_request.headers)
-        else:
-            # ----------------
-            # Use input
-            # ----------------
-            if http_request.method == "GET":
-                response = http.get(url.request_uri,
-                                    headers=http_request.headers)
-            elif http_request.method == "DELETE":
-                response = http.delete(url.request_uri,
-                                       body=http_request.post_data,
-                                       headers=http_request.headers)
-            elif http_request.method == "HEAD":
-                response = http.head(url.request_uri,
-                                     headers=http_request.headers)
-            elif http_request.method == "PUT":
-                response = http.put(url.request_uri,
-                                    body=http_request.post_data,
-                                    headers=http_request.headers)
-            elif http_request.method == "POST":
-                response = http.post(url.request_uri,
-                                     body=http_request.post_data,
-                                     headers=http_request.headers)
-            elif http_request.method == "PATCH":
-                raise Exception("Unsupported gevent method={0}".format(http_request.method))
-            elif http_request.method == "OPTIONS":
-                raise Exception("Unsupported gevent method={0}".format(http_request.method))
-            elif http_request.method == "TRACE":
-                raise Exception("Unsupported gevent method={0}".format(http_request.method))
-            else:
-                raise Exception("Invalid gevent method={0}".format(http_request.method))
-
-        logger.debug("Http done, ms=%s", SolBase.msdiff(ms_start))
-        SolBase.sleep(0)
+            method = "POST" if http_request.post_data else "GET"
+        fn = HttpClient._GEVENT_DISPATCH.get(method)
+        if fn is None:
+            if method in _BODYLESS or method in _BODIED:
+                raise Exception("Unsupported gevent method={0}".format(method))
+            raise Exception("Invalid gevent method={0}".format(method))
+        response = fn(http, url, http_request)
+        if is_debug:
+            # noinspection PyUnboundLocalVariable
+            logger.debug("Http done, ms=%s", SolBase.msdiff(ms_start))
 
         # Check
         if not response:
@@ -380,12 +604,31 @@ class HttpClient(object):
         # Process it
         http_response.status_code = response.status_code
 
+        # Headers : direct copy if no duplicated header (common case), merge otherwise
+        # noinspection PyProtectedMember
+        items = list(response._headers_index.items())
+        d = dict(items)
+        if not http_response.headers and len(d) == len(items):
+            http_response.headers = d
+        else:
+            add_header = HttpClient._add_header
+            headers = http_response.headers
+            for k, v in items:
+                add_header(headers, k, v)
+
+        # Stream : caller reads the body
+        if http_request.stream:
+            http_response.stream = response
+            http_response.content_length = response.content_length or 0
+            return
+
         # Read
-        ms_start = SolBase.mscurrent()
-        logger.debug("Read now")
+        if is_debug:
+            logger.debug("Read now")
+            ms_start = SolBase.mscurrent()
         http_response.buffer = response.read()
-        SolBase.sleep(0)
-        logger.debug("Read done, ms=%s", SolBase.msdiff(ms_start))
+        if is_debug:
+            logger.debug("Read done, ms=%s", SolBase.msdiff(ms_start))
         if response.content_length:
             http_response.content_length = response.content_length
         else:
@@ -394,110 +637,75 @@ class HttpClient(object):
             else:
                 http_response.content_length = 0
 
-        # noinspection PyProtectedMember
-        for k, v in response._headers_index.items():
-            HttpClient._add_header(http_response.headers, k, v)
-
         response.should_close()
 
-        # Over
-        SolBase.sleep(0)
-
     # ====================================
     # URLLIB3
     # ====================================
 
-    def _go_urllib3(self, http_request, http_response):
+    def _go_urllib3(self, http_request, http_response, url):
         """
         Perform an http request
         :param http_request: HttpRequest
         :type http_request: HttpRequest
         :param http_response: HttpResponse
         :type http_response: HttpResponse
+        :param url: geventhttpclient.url.URL (parsed http_request.uri)
+        :type url: geventhttpclient.url.URL
         """
 
         # Implementation
         http_response.http_implementation = HttpClient.HTTP_IMPL_URLLIB3
 
+        # Debug (checked once)
+        is_debug = logger.isEnabledFor(logging.DEBUG)
+
         # Get pool
-        logger.debug("From pool")
         cur_pool = self.urllib3_from_pool(http_request)
-        logger.debug("From pool ok")
-        SolBase.sleep(0)
 
         # From pool
-        logger.debug("From pool2")
         if http_request.http_proxy_host:
             # ProxyManager : direct
             conn = cur_pool
         else:
-            # Get connection from basic pool
-            conn = cur_pool.connection_from_url(http_request.uri)
-        logger.debug("From pool2 ok")
-        SolBase.sleep(0)
-
-        # Retries
-        retries = Retry(total=0,
-                        connect=0,
-                        read=0,
-                        redirect=0)
-        SolBase.sleep(0)
+            # Get connection from basic pool (cached)
+            conn = self._u3_connection_from_url(cur_pool, url)
 
         # Fire
-        logger.debug("urlopen")
-        if not http_request.method:
-            # ----------------
+        if is_debug:
+            logger.debug("urlopen now, conn=%s", conn)
+            ms_start = SolBase.mscurrent()
+        method = http_request.method
+        if not method:
             # Auto-detect
-            # ----------------
-            if http_request.post_data:
-                r = conn.urlopen(
-                    method='POST',
-                    url=http_request.uri,
-                    body=http_request.post_data,
-                    headers=http_request.headers,
-                    redirect=False,
-                    retries=retries,
-                )
-            else:
-                r = conn.urlopen(
-                    method='GET',
-                    url=http_request.uri,
-                    headers=http_request.headers,
-                    redirect=False,
-                    retries=retries,
-                )
-        else:
-            # ----------------
-            # Use input
-            # ----------------
-            if http_request.method in ["GET", "HEAD", "OPTIONS", "TRACE"]:
-                r = conn.urlopen(
-                    method=http_request.method,
-                    url=http_request.uri,
-                    headers=http_request.headers,
-                    redirect=False,
-                    retries=retries,
-                )
-            elif http_request.method in ["POST", "PUT", "PATCH", "DELETE"]:
-                r = conn.urlopen(
-                    method=http_request.method,
-                    url=http_request.uri,
-                    body=http_request.post_data,
-                    headers=http_request.headers,
-                    redirect=False,
-                    retries=retries,
-                )
-            else:
-                raise Exception("Invalid urllib3 method={0}".format(http_request.method))
-        logger.debug("urlopen ok")
-        SolBase.sleep(0)
+            method = "POST" if http_request.post_data else "GET"
+        fn = HttpClient._URLLIB3_DISPATCH.get(method)
+        if fn is None:
+            raise Exception("Invalid urllib3 method={0}".format(method))
+        r = fn(conn, method, http_request, HttpClient._NO_RETRY)
+        if is_debug:
+            # noinspection PyUnboundLocalVariable
+            logger.debug("urlopen done, ms=%s", SolBase.msdiff(ms_start))
 
         # Ok
         http_response.status_code = r.status
-        for k, v in r.headers.items():
-            HttpClient._add_header(http_response.headers, k, v)
+
+        # Headers : direct copy if no duplicated header (common case), merge otherwise
+        # HTTPHeaderDict.items() returns one pair per header line, len() one per header name
+        items = list(r.headers.items())
+        if not http_response.headers and len(r.headers) == len(items):
+            http_response.headers = dict(items)
+        else:
+            add_header = HttpClient._add_header
+            headers = http_response.headers
+            for k, v in items:
+                add_header(headers, k, v)
+
+        # Stream : caller reads the body
+        if http_request.stream:
+            http_response.stream = r
+            http_response.content_length = r.length_remaining or 0
+            return
+
         http_response.buffer = r.data
         http_response.content_length = len(http_response.buffer)
-
-        # Over
-        SolBase.sleep(0)
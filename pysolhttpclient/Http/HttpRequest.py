@@ -21,6 +21,8 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA
 # ===============================================================================
 """
+from geventhttpclient.client import PROTO_HTTPS
+
 from pysolhttpclient.Http.HttpClient import HttpClient
 
 
@@ -80,6 +82,42 @@ class HttpRequest(object):
         # Force implementation
         self.force_http_implementation = HttpClient.HTTP_IMPL_AUTO
 
+        # Stream response body
+        # If set, body is not read : HttpResponse.stream holds the underlying response, HttpResponse.buffer is None
+        # Caller must read it and release it (gevent : read() then release(), urllib3 : read() then release_conn())
+        # Caution : reading is performed out of general_timeout_ms
+        self.stream = False
+
+    # ====================================
+    # IMPLEMENTATION
+    # ====================================
+
+    @property
+    def resolved_impl(self):
+        """
+        Http implementation to use : force_http_implementation, with auto and proxy + https resolved
+        :return int
+        :rtype int
+        """
+
+        impl = self.force_http_implementation
+        if impl == HttpClient.HTTP_IMPL_AUTO:
+            # Fallback gevent (urllib3 issue with latest uwsgi, gevent 1.1.1)
+            impl = HttpClient.HTTP_IMPL_URLLIB3
+            # impl = HttpClient.HTTP_IMPL_GEVENT
+
+        # If proxy and https => urllib3
+        if self.http_proxy_host and self.uri.lower().startswith(PROTO_HTTPS + ":"):
+            # Fallback gevent (urllib3 issue with latest uwsgi, gevent 1.1.1)
+            impl = HttpClient.HTTP_IMPL_URLLIB3
+            # impl = HttpClient.HTTP_IMPL_GEVENT
+
+        return impl
+
+    # ====================================
+    # MISC
+    # ====================================
+
     def __str__(self):
         """
         To string override
@@ -87,7 +125,7 @@ class HttpRequest(object):
         :rtype str
         """
 
-        return "hreq:uri={0}*m={1}*pd={2}*ka={3}*cc={4}*httpsi={5}*prox={6}*socks={7}*force={8}*h={9}*to.c/n/g={10}/{11}/{12}".format(
+        return "hreq:uri={0}*m={1}*pd={2}*ka={3}*cc={4}*httpsi={5}*prox={6}*socks={7}*force={8}*h={9}*to.c/n/g={10}/{11}/{12}*st={13}".format(
             self.uri,
             self.method,
             len(self.post_data) if self.post_data else "None",
@@ -99,4 +137,5 @@ class HttpRequest(object):
             self.force_http_implementation,
             self.headers,
             self.connection_timeout_ms, self.network_timeout_ms, self.general_timeout_ms,
+            self.stream,
         )
@@ -49,6 +49,10 @@ class HttpResponse(object):
         # Response buffer (binary / bytes)
         self.buffer = None
 
+        # Response stream (if HttpRequest.stream is set, buffer is None then)
+        # geventhttpclient or urllib3 response, to be read and released by caller
+        self.stream = None
+
         # Response headers
         # It can be
         # - bytes => bytes
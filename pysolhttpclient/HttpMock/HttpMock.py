@@ -390,6 +390,10 @@ class HttpMock(object):
             body += "from_post=" + str(from_post) + " -EOL\n"
             body += "from_method=" + from_method + "\n"
             headers = [('Content-Type', 'text/txt')]
+            # Repeated header if requested (comma separated values, one header line per value)
+            if "set_cookie" in from_qs:
+                for v in from_qs["set_cookie"].split(","):
+                    headers.append(('Set-Cookie', v))
             start_response(status, headers)
             logger.debug("reply send")
         return [SolBase.unicode_to_binary(body, "utf-8")]
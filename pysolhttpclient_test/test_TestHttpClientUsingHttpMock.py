@@ -24,10 +24,14 @@
 
 import logging
 import unittest
+from collections import OrderedDict
 from urllib import parse
 
+from gevent.threading import Lock
+from geventhttpclient.url import URL
 from pysolbase.FileUtility import FileUtility
 from pysolbase.SolBase import SolBase
+from urllib3 import PoolManager
 
 from pysolhttpclient.Http.HttpClient import HttpClient
 from pysolhttpclient.Http.HttpRequest import HttpRequest
@@ -111,6 +115,189 @@ class TestHttpClientUsingHttpMock(unittest.TestCase):
         self.assertIn("toto_v2", d["toto"])
         self.assertIn("toto_v3", d["toto"])
 
+    def test_pool_key(self):
+        """
+        Test
+        """
+
+        hc = HttpClient()
+        hreq = HttpRequest()
+        hreq.uri = "http://a.example:80/"
+
+        # Same url and request : same client
+        http_a = hc.gevent_from_pool(URL(hreq.uri), hreq)
+        self.assertEqual(id(http_a), id(hc.gevent_from_pool(URL(hreq.uri), hreq)))
+
+        # Key is built from url argument
+        http_b = hc.gevent_from_pool(URL("http://b.example:81/"), hreq)
+        self.assertNotEqual(id(http_a), id(http_b))
+
+        # Request field change : new client
+        hreq.network_timeout_ms = 5000
+        http_c = hc.gevent_from_pool(URL(hreq.uri), hreq)
+        self.assertNotEqual(id(http_a), id(http_c))
+        hreq.connection_timeout_ms = 250
+        http_d = hc.gevent_from_pool(URL(hreq.uri), hreq)
+        self.assertNotEqual(id(http_c), id(http_d))
+
+        # Not part of key : same client
+        hreq.post_data = "toto"
+        self.assertEqual(id(http_d), id(hc.gevent_from_pool(URL(hreq.uri), hreq)))
+
+    def test_pool_lru(self):
+        """
+        Test
+        """
+
+        hc = HttpClient()
+
+        # Single shard, 2 entries max
+        shard = (Lock(), OrderedDict())
+        hc._gevent_shards = [shard] * HttpClient.POOL_SHARD_COUNT
+        hc._gevent_pool_max = 2
+
+        d_http = dict()
+        for port in [7901, 7902]:
+            hreq = HttpRequest()
+            hreq.uri = "http://127.0.0.1:{0}/unittest".format(port)
+            d_http[port] = (hreq, hc.gevent_from_pool(URL(hreq.uri), hreq))
+        self.assertEqual(len(shard[1]), 2)
+
+        # Hit 7901 (7902 is now the coldest)
+        hreq, http = d_http[7901]
+        self.assertEqual(id(http), id(hc.gevent_from_pool(URL(hreq.uri), hreq)))
+
+        # Allocate 7903 : 7902 evicted
+        hreq = HttpRequest()
+        hreq.uri = "http://127.0.0.1:7903/unittest"
+        http = hc.gevent_from_pool(URL(hreq.uri), hreq)
+        self.assertEqual(len(shard[1]), 2)
+        ar_id = [id(e.client) for e in shard[1].values()]
+        self.assertIn(id(d_http[7901][1]), ar_id)
+        self.assertNotIn(id(d_http[7902][1]), ar_id)
+        self.assertIn(id(http), ar_id)
+        self.assertEqual(hc._gevent_pool_size, 2)
+
+    def test_u3_pool_lru(self):
+        """
+        Test
+        """
+
+        hc = HttpClient()
+
+        # Own manager and cache, 2 entries max
+        hc._u3_basic_pool = PoolManager(num_pools=2)
+        hc._u3_conn_cache_max = 2
+
+        d_conn = dict()
+        for port in [7901, 7902]:
+            d_conn[port] = hc._u3_connection_from_url(hc._u3_basic_pool, URL("http://127.0.0.1:{0}/unittest".format(port)))
+        self.assertEqual(len(hc._u3_conn_cache), 2)
+        self.assertEqual(len(hc._u3_basic_pool.pools), 2)
+
+        # Hit 7901 (7902 is now the coldest, in cache and in manager)
+        self.assertEqual(id(d_conn[7901]), id(hc._u3_connection_from_url(hc._u3_basic_pool, URL("http://127.0.0.1:7901/unittest"))))
+
+        # Allocate 7903 : 7902 evicted (cache and manager), 7901 alive
+        conn = hc._u3_connection_from_url(hc._u3_basic_pool, URL("http://127.0.0.1:7903/unittest"))
+        self.assertEqual(list(hc._u3_conn_cache.keys()), [("http", "127.0.0.1", 7901), ("http", "127.0.0.1", 7903)])
+        self.assertEqual(len(hc._u3_basic_pool.pools), 2)
+        self.assertIsNone(d_conn[7902].pool)
+        self.assertIsNotNone(d_conn[7901].pool)
+        self.assertEqual(id(d_conn[7901]), id(hc._u3_connection_from_url(hc._u3_basic_pool, URL("http://127.0.0.1:7901/unittest"))))
+        self.assertEqual(id(conn), id(hc._u3_connection_from_url(hc._u3_basic_pool, URL("http://127.0.0.1:7903/unittest"))))
+
+        # Evicted by the manager only : re-allocated
+        hc._u3_basic_pool.clear()
+        conn2 = hc._u3_connection_from_url(hc._u3_basic_pool, URL("http://127.0.0.1:7903/unittest"))
+        self.assertNotEqual(id(conn), id(conn2))
+        self.assertIsNotNone(conn2.pool)
+
+        # Ipv6 literal : same pool as urllib3 own url path
+        hc._u3_conn_cache.clear()
+        conn = hc._u3_connection_from_url(hc._u3_basic_pool, URL("http://[::1]:8080/unittest"))
+        self.assertEqual(conn.host, "::1")
+        self.assertEqual(id(conn), id(hc._u3_basic_pool.connection_from_url("http://[::1]:8080/unittest")))
+        self.assertEqual(id(conn), id(hc._u3_connection_from_url(hc._u3_basic_pool, URL("http://[::1]:8080/unittest"))))
+        self.assertEqual(len(hc._u3_basic_pool.pools), 2)
+
+    def test_httpmock_pool_evict_in_use(self):
+        """
+        Test
+        """
+
+        self.h = HttpMock()
+        self.h.start()
+        self.assertTrue(self.h._is_running)
+
+        hc = HttpClient()
+
+        # Single shard, 1 entry max
+        shard = (Lock(), OrderedDict())
+        hc._gevent_shards = [shard] * HttpClient.POOL_SHARD_COUNT
+        hc._gevent_pool_max = 1
+
+        # Stream a response (in use, not read)
+        hreq = HttpRequest()
+        hreq.force_http_implementation = HttpClient.HTTP_IMPL_GEVENT
+        hreq.uri = "http://127.0.0.1:7900/unittest"
+        hreq.stream = True
+        hresp = hc.go_http(hreq)
+        self.assertIsNone(hresp.exception)
+        self.assertIsNotNone(hresp.stream)
+        http = hc.gevent_from_pool(URL(hreq.uri), hreq)
+
+        # Another pool : evict the previous one
+        hreq2 = HttpRequest()
+        hreq2.force_http_implementation = HttpClient.HTTP_IMPL_GEVENT
+        hreq2.uri = "http://127.0.0.1:7900/unittest"
+        hreq2.network_timeout_ms = 5000
+        hresp2 = hc.go_http(hreq2)
+        self.assertIsNone(hresp2.exception)
+        self.assertEqual(hresp2.status_code, 200)
+        self.assertEqual(len(shard[1]), 1)
+        self.assertNotIn(id(http), [id(e.client) for e in shard[1].values()])
+
+        # Evicted : stream still readable
+        buf = hresp.stream.read()
+        hresp.stream.release()
+        self.assertEqual(SolBase.binary_to_unicode(buf, "utf-8"),
+                         "OK\nfrom_qs={} -EOL\nfrom_post={} -EOL\nfrom_method=GET\n")
+
+        # Evicted : client still usable
+        response = http.get("/unittest")
+        self.assertEqual(response.status_code, 200)
+        response.read()
+        response.release()
+
+        # Over
+        self.h.stop()
+        self.assertFalse(self.h._is_running)
+
+    def test_resolved_impl(self):
+        """
+        Test
+        """
+
+        hreq = HttpRequest()
+        hreq.uri = "https://127.0.0.1:7900/unittest"
+
+        # Auto => urllib3
+        self.assertEqual(hreq.resolved_impl, HttpClient.HTTP_IMPL_URLLIB3)
+
+        # Forced
+        hreq.force_http_implementation = HttpClient.HTTP_IMPL_GEVENT
+        self.assertEqual(hreq.resolved_impl, HttpClient.HTTP_IMPL_GEVENT)
+
+        # Proxy and https => urllib3
+        hreq.http_proxy_host = "127.0.0.1"
+        hreq.http_proxy_port = 1180
+        self.assertEqual(hreq.resolved_impl, HttpClient.HTTP_IMPL_URLLIB3)
+
+        # Proxy and http => forced
+        hreq.uri = "http://127.0.0.1:7900/unittest"
+        self.assertEqual(hreq.resolved_impl, HttpClient.HTTP_IMPL_GEVENT)
+
     def test_get_basic_gevent(self):
         """
         Test
@@ -239,6 +426,103 @@ class TestHttpClientUsingHttpMock(unittest.TestCase):
 
         self._http_basic_internal_to_httpmock(HttpClient.HTTP_IMPL_URLLIB3, proxy=False)
 
+    def test_httpmock_repeated_header_gevent(self):
+        """
+        Test
+        """
+
+        self._http_repeated_header_internal_to_httpmock(HttpClient.HTTP_IMPL_GEVENT)
+
+    def test_httpmock_repeated_header_urllib3(self):
+        """
+        Test
+        """
+
+        self._http_repeated_header_internal_to_httpmock(HttpClient.HTTP_IMPL_URLLIB3)
+
+    def _http_repeated_header_internal_to_httpmock(self, force_implementation):
+        """
+        Test
+        """
+
+        logger.info("impl=%s", force_implementation)
+
+        self.h = HttpMock()
+        self.h.start()
+        self.assertTrue(self.h._is_running)
+
+        hc = HttpClient()
+        hreq = HttpRequest()
+        hreq.force_http_implementation = force_implementation
+        hreq.uri = "http://127.0.0.1:7900/unittest?" + parse.urlencode({"set_cookie": "a=1,b=2"})
+        hresp = hc.go_http(hreq)
+        logger.info("Got=%s", hresp)
+        self.assertIsNone(hresp.exception)
+        self.assertEqual(hresp.status_code, 200)
+
+        # Repeated header : list
+        self.assertEqual(hresp.headers["Set-Cookie"], ["a=1", "b=2"])
+
+        # Single header : direct
+        self.assertEqual(hresp.headers["Content-Type"], "text/txt")
+
+        # Over
+        self.h.stop()
+        self.assertFalse(self.h._is_running)
+
+    def test_httpmock_stream_gevent(self):
+        """
+        Test
+        """
+
+        self._http_stream_internal_to_httpmock(HttpClient.HTTP_IMPL_GEVENT)
+
+    def test_httpmock_stream_urllib3(self):
+        """
+        Test
+        """
+
+        self._http_stream_internal_to_httpmock(HttpClient.HTTP_IMPL_URLLIB3)
+
+    def _http_stream_internal_to_httpmock(self, force_implementation):
+        """
+        Test
+        """
+
+        logger.info("impl=%s", force_implementation)
+
+        self.h = HttpMock()
+        self.h.start()
+        self.assertTrue(self.h._is_running)
+
+        hc = HttpClient()
+        hreq = HttpRequest()
+        hreq.force_http_implementation = force_implementation
+        hreq.uri = "http://127.0.0.1:7900/unittest?" + parse.urlencode({"p1": "v1 2.3/4"})
+        hreq.stream = True
+        hresp = hc.go_http(hreq)
+        logger.info("Got=%s", hresp)
+        self.assertIsNone(hresp.exception)
+        self.assertEqual(hresp.status_code, 200)
+        self.assertEqual(hresp.http_implementation, force_implementation)
+        self.assertIsNone(hresp.buffer)
+        self.assertIsNotNone(hresp.stream)
+        self.assertGreater(len(hresp.headers), 0)
+
+        # Read it
+        buf = hresp.stream.read()
+        if force_implementation == HttpClient.HTTP_IMPL_GEVENT:
+            hresp.stream.release()
+        else:
+            hresp.stream.release_conn()
+        self.assertEqual(hresp.content_length, len(buf))
+        self.assertEqual(SolBase.binary_to_unicode(buf, "utf-8"),
+                         "OK\nfrom_qs={'p1': 'v1 2.3/4'} -EOL\nfrom_post={} -EOL\nfrom_method=GET\n")
+
+        # Over
+        self.h.stop()
+        self.assertFalse(self.h._is_running)
+
     @unittest.skipIf(not is_squid_present(), "squid not detected")
     def test_httpmock_proxy_squid_gevent(self):
         """